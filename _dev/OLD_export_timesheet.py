@@ -16,38 +16,36 @@ def process_timesheet(csv_file, output_excel):
         format='%Y-%m-%d %H:%M:%S'
     )
     
+    # Low-cardinality person columns group on integer codes as categoricals.
+    for col in ['Person ID', 'Person Name']:
+        df[col] = df[col].astype('category')
+    
     # Group by Person ID, Person Name, and Punch Date to get check‑in and check‑out per day.
-    grouped = df.groupby(['Person ID', 'Person Name', 'Punch Date'])
+    # Assume the earliest record is check‑in and the latest is check‑out.
+    agg = (
+        df.sort_values(by='Datetime', kind='stable')
+        .groupby(['Person ID', 'Person Name', 'Punch Date'], as_index=False, observed=True)['Datetime']
+        .agg(first='first', last='last')
+    )
     
-    records = []
-    for (person_id, person_name, punch_date), group in grouped:
-        # Assume the earliest record is check‑in and the latest is check‑out.
-        group_sorted = group.sort_values(by='Datetime')
-        check_in = group_sorted.iloc[0]['Datetime']
-        check_out = group_sorted.iloc[-1]['Datetime']
-        hours_worked = round((check_out - check_in).total_seconds() / 3600, 2)
-        records.append({
-            'Person ID': person_id,
-            'Person Name': person_name,
-            'Punch Date': punch_date,
-            'Check-in': check_in.strftime("%H:%M:%S"),
-            'Check-out': check_out.strftime("%H:%M:%S"),
-            'Hours Worked': hours_worked
-        })
+    records_df = agg[['Person ID', 'Person Name', 'Punch Date']].copy()
+    records_df['Check-in'] = agg['first'].dt.strftime("%H:%M:%S")
+    records_df['Check-out'] = agg['last'].dt.strftime("%H:%M:%S")
+    records_df['Hours Worked'] = [
+        round(seconds / 3600, 2) for seconds in (agg['last'] - agg['first']).dt.total_seconds().tolist()
+    ]
     
-    # Convert the list of records into a DataFrame.
-    records_df = pd.DataFrame(records)
+    # Sort once by person and Punch Date so each group is already in order.
+    records_df = records_df.sort_values(by=['Person ID', 'Person Name', 'Punch Date'], kind='mergesort')
     
-    # Create a dictionary to hold each person's DataFrame.
-    persons = {}
-    for (person_id, person_name), group in records_df.groupby(['Person ID', 'Person Name']):
-        # Sort by Punch Date.
-        df_person = group.sort_values(by='Punch Date').reset_index(drop=True)
-        persons[(person_id, person_name)] = df_person.drop(columns=['Person ID', 'Person Name'])
+    # Columns written to each person's table.
+    table_columns = ['Punch Date', 'Check-in', 'Check-out', 'Hours Worked']
     
-    # Write the data to an Excel file with one sheet per person.
+    # Write the data to an Excel file with one sheet per person, straight from the groups.
     with pd.ExcelWriter(output_excel, engine="xlsxwriter") as writer:
-        for (person_id, person_name), df_person in persons.items():
+        for (person_id, person_name), df_person in records_df.groupby(
+            ['Person ID', 'Person Name'], sort=False, observed=True
+        ):
             # Construct sheet name.
             sheet_name = f"{person_id} - {person_name}"
             if len(sheet_name) > 31:
@@ -58,7 +56,7 @@ def process_timesheet(csv_file, output_excel):
             # Row 1: blank.
             # Row 2: table header (written by to_excel) and data starts at row 3.
             start_row = 2
-            df_person.to_excel(writer, sheet_name=sheet_name, index=False, startrow=start_row)
+            df_person.to_excel(writer, sheet_name=sheet_name, index=False, startrow=start_row, columns=table_columns)
             
             # Get the workbook and worksheet objects.
             workbook  = writer.book
@@ -7,6 +7,7 @@ import warnings as py_warnings
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 from xlsxwriter.utility import quote_sheetname
 
@@ -14,6 +15,13 @@ from xlsxwriter.utility import quote_sheetname
 LOCAL_TZ = ZoneInfo("America/Puerto_Rico")
 LOCATION_BUCKETS = ["Mango Villas", "Casa Damisela", "MARU", "Other"]
 AMBIGUOUS_PERSON = object()
+PERIOD_DATE_RE = re.compile(r"(\d{2}-\d{2}-\d{4})")
+NON_ALPHA_RE = re.compile(r"[^A-Z\s]")
+WHITESPACE_RE = re.compile(r"\s+")
+FLOAT_ID_RE = re.compile(r"\d+\.0")
+MARU_ROOM_RE = re.compile(r"\bROOM\s+(ONE|TWO|THREE|FOUR|FIVE|[1-5])\b")
+SHEET_NAME_INVALID_RE = re.compile(r"[\[\]\:\*\?\/\\]")
+TWO_DIGIT_TEXT = np.array([f"{value:02d}" for value in range(100)])
 
 
 def normalize_name_tokens(name):
@@ -22,8 +30,8 @@ def normalize_name_tokens(name):
     normalized = unicodedata.normalize("NFKD", name)
     normalized = "".join(ch for ch in normalized if not unicodedata.combining(ch))
     normalized = normalized.upper()
-    normalized = re.sub(r"[^A-Z\s]", " ", normalized)
-    normalized = re.sub(r"\s+", " ", normalized).strip()
+    normalized = NON_ALPHA_RE.sub(" ", normalized)
+    normalized = WHITESPACE_RE.sub(" ", normalized).strip()
     return normalized.split()
 
 
@@ -46,7 +54,7 @@ def id_key(value):
     if pd.isna(value):
         return ""
     text = str(value).strip()
-    if re.fullmatch(r"\d+\.0", text):
+    if FLOAT_ID_RE.fullmatch(text):
         return text[:-2]
     return text
 
@@ -60,7 +68,7 @@ def map_turno_location(property_group, property_alias):
     if "MARU" in combined:
         return "MARU"
     # MARU rooms are exported with a blank Property Group and aliases like "ROOM ONE".
-    if re.search(r"\bROOM\s+(ONE|TWO|THREE|FOUR|FIVE|[1-5])\b", combined):
+    if MARU_ROOM_RE.search(combined):
         return "MARU"
     return "Other"
 
@@ -81,9 +89,10 @@ def _find_date_in_paths(output_excel, input_paths):
     for path in [output_excel, *input_paths]:
         if not path:
             continue
-        match = re.search(r"(\d{2}-\d{2}-\d{4})", os.path.basename(path))
+        match = PERIOD_DATE_RE.search(os.path.basename(path))
         if match:
-            return datetime.strptime(match.group(1), "%m-%d-%Y")
+            month, day, year = match.group(1).split("-")
+            return datetime(int(year), int(month), int(day))
     return None
 
 
@@ -119,6 +128,13 @@ def _parse_datetime_series(series, formats):
     return parsed
 
 
+def _format_clock_times(series):
+    """Format a datetime Series as HH:MM:SS from its integer fields instead of strftime."""
+    text = [TWO_DIGIT_TEXT[field.to_numpy()] for field in [series.dt.hour, series.dt.minute, series.dt.second]]
+    joined = np.char.add(np.char.add(np.char.add(np.char.add(text[0], ":"), text[1]), ":"), text[2])
+    return pd.Series(joined, index=series.index)
+
+
 def _parse_money_value(value):
     if pd.isna(value):
         return None
@@ -145,6 +161,19 @@ def _normalize_reimbursable(value):
     return "No", False, True
 
 
+def _read_source_csv(path, label, **kwargs):
+    """Read an input CSV through a memory map, naming the source if the file is missing or empty."""
+    try:
+        return pd.read_csv(path, memory_map=True, **kwargs)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{label} file not found: {path}") from None
+    except ValueError as exc:
+        # A zero-byte file cannot be memory-mapped; a blank one has no header for pandas to parse.
+        if isinstance(exc, pd.errors.EmptyDataError) or os.path.getsize(path) == 0:
+            raise ValueError(f"{label} file is empty: {path}") from None
+        raise
+
+
 def _load_rates(rates_csv, source_file, warnings):
     if rates_csv and os.path.exists(rates_csv):
         rates_file = rates_csv
@@ -157,7 +186,7 @@ def _load_rates(rates_csv, source_file, warnings):
         warnings.append("'timesheet-rates.csv' not found. Hourly rates and extras default to $0.")
         return {}, {}
 
-    rates_df = pd.read_csv(rates_file)
+    rates_df = _read_source_csv(rates_file, "Rates")
     rates_df.columns = [col.strip() for col in rates_df.columns]
 
     required_cols = ["ID", "RATE", "START", "EXTRA"]
@@ -168,24 +197,23 @@ def _load_rates(rates_csv, source_file, warnings):
         )
         return {}, {}
 
-    rates_df["START"] = pd.to_datetime(rates_df["START"], errors="coerce")
-    rates_df["RATE"] = pd.to_numeric(rates_df["RATE"], errors="coerce").fillna(0)
-    rates_df["EXTRA"] = pd.to_numeric(rates_df["EXTRA"], errors="coerce").fillna(0)
+    rates_df["START"] = _parse_datetime_series(rates_df["START"], ["%m-%d-%Y", "%Y-%m-%d"])
+    rates_df["RATE"] = pd.to_numeric(rates_df["RATE"], errors="coerce").fillna(0).astype(float)
+    rates_df["EXTRA"] = pd.to_numeric(rates_df["EXTRA"], errors="coerce").fillna(0).astype(float)
+    rates_df["ID"] = rates_df["ID"].map(id_key)
+    for col in ["NAME", "DETAILS"]:
+        rates_df[col] = rates_df[col].map(clean_value) if col in rates_df.columns else ""
+    rates_df = rates_df[rates_df["ID"] != ""]
+
+    # Later rows win when an ID is repeated, matching the previous row-by-row build.
+    rates_dict = (
+        rates_df.drop_duplicates(subset="ID", keep="last")
+        .set_index("ID")[["NAME", "RATE", "START", "EXTRA", "DETAILS"]]
+        .to_dict(orient="index")
+    )
 
-    rates_dict = {}
     rates_by_name = {}
-    for _, row in rates_df.iterrows():
-        person_id = id_key(row["ID"])
-        if not person_id:
-            continue
-        person_name = clean_value(row.get("NAME", ""))
-        rates_dict[person_id] = {
-            "NAME": person_name,
-            "RATE": float(row["RATE"]),
-            "START": row["START"],
-            "EXTRA": float(row["EXTRA"]),
-            "DETAILS": clean_value(row.get("DETAILS", "")),
-        }
+    for person_id, person_name in zip(rates_df["ID"], rates_df["NAME"]):
         if person_name:
             nk = name_key(person_name)
             if nk[0]:
@@ -265,7 +293,10 @@ def _person_from_name(person_name, persons, rates_by_name, warnings, context):
 
 
 def _parse_timeclock(csv_file, persons, hourly_events, turno_events, warnings):
-    df = pd.read_csv(csv_file)
+    # The punch columns are only ever joined as text. Person ID keeps type inference so
+    # zero-padded IDs read as numbers and match the rates file keys, as before.
+    punch_dtypes = {"Punch Date": str, "Attendance record": str}
+    df = _read_source_csv(csv_file, "Timeclock", dtype=punch_dtypes, skipinitialspace=True)
     df.columns = [col.strip() for col in df.columns]
     required_cols = ["Person ID", "Person Name", "Punch Date", "Attendance record"]
     missing_cols = [col for col in required_cols if col not in df.columns]
@@ -276,13 +307,15 @@ def _parse_timeclock(csv_file, persons, hourly_events, turno_events, warnings):
         warnings.append(f"Timeclock file '{os.path.basename(csv_file)}' has no rows.")
         return
 
-    datetime_str = df["Punch Date"].astype(str).str.strip() + " " + df["Attendance record"].astype(str).str.strip()
-    df["Datetime"] = pd.to_datetime(datetime_str, format="%Y-%m-%d %H:%M:%S", errors="coerce")
-    mask_failed = df["Datetime"].isna()
-    if mask_failed.any():
-        df.loc[mask_failed, "Datetime"] = pd.to_datetime(
-            datetime_str[mask_failed], format="%m/%d/%Y %H:%M:%S", errors="coerce"
-        )
+    datetime_str = df["Punch Date"].str.cat(df["Attendance record"], sep=" ")
+    # Punch strings repeat across rows, so parse each distinct value once and map back.
+    # Trailing spaces are trimmed here, on the distinct values only.
+    unique_str = pd.Series(datetime_str.unique())
+    unique_text = unique_str.str.replace(r"\s+", " ", regex=True).str.strip()
+    parsed = pd.to_datetime(unique_text, format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    if parsed.isna().any():
+        parsed = parsed.combine_first(pd.to_datetime(unique_text, format="%m/%d/%Y %H:%M:%S", errors="coerce"))
+    df["Datetime"] = datetime_str.map(pd.Series(parsed.to_numpy(), index=unique_str))
 
     if df["Datetime"].isna().any():
         skipped = int(df["Datetime"].isna().sum())
@@ -293,11 +326,33 @@ def _parse_timeclock(csv_file, persons, hourly_events, turno_events, warnings):
         warnings.append(f"Timeclock file '{os.path.basename(csv_file)}' had no usable rows.")
         return
 
-    for (person_id, person_name, punch_date), group in df.groupby(["Person ID", "Person Name", "Punch Date"]):
-        group_sorted = group.sort_values(by="Datetime")
-        check_in = group_sorted.iloc[0]["Datetime"]
-        check_out = group_sorted.iloc[-1]["Datetime"]
-        hours_worked = round((check_out - check_in).total_seconds() / 3600, 2)
+    # Low-cardinality person columns group on integer codes as categoricals.
+    for col in ["Person ID", "Person Name"]:
+        df[col] = df[col].astype("category")
+
+    # Earliest punch per person per day is the check-in, latest is the check-out.
+    daily = (
+        df.sort_values("Datetime", kind="stable")
+        .groupby(["Person ID", "Person Name", "Punch Date"], as_index=False, observed=True)["Datetime"]
+        .agg(check_in="first", check_out="last")
+    )
+    # Built-in round per person-day: np.round scales by 100 first and drifts on half centi-hours.
+    durations = (daily["check_out"] - daily["check_in"]).dt.total_seconds().tolist()
+    daily["Hours"] = [round(seconds / 3600, 2) for seconds in durations]
+    daily["Date"] = daily["check_in"].dt.strftime("%m/%d/%Y")
+    daily["Start"] = _format_clock_times(daily["check_in"])
+    daily["End"] = _format_clock_times(daily["check_out"])
+
+    for person_id, person_name, punch_date, check_in, date_text, start_text, end_text, hours_worked in zip(
+        daily["Person ID"],
+        daily["Person Name"],
+        daily["Punch Date"],
+        daily["check_in"],
+        daily["Date"],
+        daily["Start"],
+        daily["End"],
+        daily["Hours"],
+    ):
         if hours_worked <= 0:
             warnings.append(f"Timeclock row for '{person_name}' on {punch_date} has no positive hours; row skipped.")
             continue
@@ -307,17 +362,17 @@ def _parse_timeclock(csv_file, persons, hourly_events, turno_events, warnings):
         hourly_events[person_key].append({
             "source": "Timeclock",
             "location": "Maru",
-            "date": check_in.strftime("%m/%d/%Y"),
-            "start": check_in.strftime("%H:%M:%S"),
-            "end": check_out.strftime("%H:%M:%S"),
-            "hours": hours_worked,
+            "date": date_text,
+            "start": start_text,
+            "end": end_text,
+            "hours": float(hours_worked),
             "details": "",
             "start_dt": check_in,
         })
 
 
 def _parse_notion(notion_csv, persons, hourly_events, turno_events, rates_by_name, warnings):
-    notion_df = pd.read_csv(notion_csv)
+    notion_df = _read_source_csv(notion_csv, "Notion")
     notion_df.columns = [col.strip() for col in notion_df.columns]
     expected_cols = [
         "Date",
@@ -414,7 +469,7 @@ def _parse_notion(notion_csv, persons, hourly_events, turno_events, rates_by_nam
 
 
 def _parse_turno(turno_csv, persons, hourly_events, turno_events, rates_by_name, warnings):
-    turno_df = pd.read_csv(turno_csv)
+    turno_df = _read_source_csv(turno_csv, "Turno")
     turno_df.columns = [col.strip() for col in turno_df.columns]
 
     expected_cols = [
@@ -496,7 +551,7 @@ def _parse_turno(turno_csv, persons, hourly_events, turno_events, rates_by_name,
 
 
 def _parse_expenses(expenses_csv, persons, hourly_events, turno_events, expense_events, rates_by_name, warnings):
-    expenses_df = pd.read_csv(expenses_csv)
+    expenses_df = _read_source_csv(expenses_csv, "Expenses")
     expenses_df.columns = [col.strip() for col in expenses_df.columns]
 
     expected_cols = [
@@ -596,7 +651,7 @@ def _parse_expenses(expenses_csv, persons, hourly_events, turno_events, expense_
 
 
 def _safe_sheet_name(base_name, used_names):
-    safe_name = re.sub(r"[\[\]\:\*\?\/\\]", "-", base_name).strip() or "Employee"
+    safe_name = SHEET_NAME_INVALID_RE.sub("-", base_name).strip() or "Employee"
     safe_name = safe_name[:31]
     candidate = safe_name
     suffix = 2
@@ -704,15 +759,7 @@ def process_timesheet(csv_file, output_excel, turno_csv=None, rates_csv=None, no
     if not has_timeclock and not has_turno and not has_notion and not has_expenses:
         raise ValueError("At least one input file (Notion, Turno, Timeclock, or Expenses CSV) is required.")
 
-    if has_timeclock and not os.path.exists(csv_file):
-        raise FileNotFoundError(f"Timeclock file not found: {csv_file}")
-    if has_turno and not os.path.exists(turno_csv):
-        raise FileNotFoundError(f"Turno file not found: {turno_csv}")
-    if has_notion and not os.path.exists(notion_csv):
-        raise FileNotFoundError(f"Notion file not found: {notion_csv}")
-    if has_expenses and not os.path.exists(expenses_csv):
-        raise FileNotFoundError(f"Expenses file not found: {expenses_csv}")
-
+    # Missing inputs surface as FileNotFoundError from _read_source_csv when each file is read.
     input_files = [path for path in [notion_csv, csv_file, turno_csv, expenses_csv] if path]
     source_file = input_files[0]
     rates_dict, rates_by_name = _load_rates(rates_csv, source_file, warnings)
@@ -734,7 +781,13 @@ def process_timesheet(csv_file, output_excel, turno_csv=None, rates_csv=None, no
     period_end = _find_date_in_paths(output_excel, input_files)
     missing_rate_people = set()
 
-    with pd.ExcelWriter(output_excel, engine="xlsxwriter") as writer:
+    # constant_memory flushes each row once a later row is started, so every sheet
+    # below must be written strictly top-to-bottom.
+    with pd.ExcelWriter(
+        output_excel,
+        engine="xlsxwriter",
+        engine_kwargs={"options": {"constant_memory": True}},
+    ) as writer:
         workbook = writer.book
         header_format = workbook.add_format({"bold": True, "border": 1})
         currency_format = workbook.add_format({"num_format": "$#,##0.00"})
@@ -749,10 +802,8 @@ def process_timesheet(csv_file, output_excel, turno_csv=None, rates_csv=None, no
         used_sheet_names = {"Summary"}
 
         def write_hourly_section(worksheet, start_row, data_rows, hourly_rate):
-            worksheet.write(start_row, 0, "Hourly Work", header_format)
-            section_headers = ["Date", "Start", "End", "Hours", "Rate $", "Total $", "Details"]
-            for col, name in enumerate(section_headers, start=1):
-                worksheet.write(start_row, col, name, header_format)
+            section_headers = ["Hourly Work", "Date", "Start", "End", "Hours", "Rate $", "Total $", "Details"]
+            worksheet.write_row(start_row, 0, section_headers, header_format)
 
             data_start = start_row + 1
             row_count = max(1, len(data_rows))
@@ -760,10 +811,12 @@ def process_timesheet(csv_file, output_excel, turno_csv=None, rates_csv=None, no
                 excel_row = data_start + offset + 1
                 if offset < len(data_rows):
                     row_data = data_rows[offset]
-                    worksheet.write(data_start + offset, 0, row_data.get("location", ""))
-                    worksheet.write(data_start + offset, 1, row_data.get("date", ""))
-                    worksheet.write(data_start + offset, 2, row_data.get("start", ""))
-                    worksheet.write(data_start + offset, 3, row_data.get("end", ""))
+                    worksheet.write_row(data_start + offset, 0, [
+                        row_data.get("location", ""),
+                        row_data.get("date", ""),
+                        row_data.get("start", ""),
+                        row_data.get("end", ""),
+                    ])
                     worksheet.write_number(data_start + offset, 4, row_data.get("hours", 0))
                     worksheet.write_number(data_start + offset, 5, hourly_rate, currency_format)
                     worksheet.write_formula(data_start + offset, 6, f"=E{excel_row}*F{excel_row}", currency_format)
@@ -783,26 +836,24 @@ def process_timesheet(csv_file, output_excel, turno_csv=None, rates_csv=None, no
 
         def write_location_section(worksheet, start_row, header_title, data_rows=None):
             data_rows = data_rows or []
-            worksheet.write(start_row, 0, header_title, header_format)
-            section_headers = ["Date", "Start", "End", "Hours", "Rate $", "Details"]
-            for col, name in enumerate(section_headers, start=1):
-                worksheet.write(start_row, col, name, header_format)
+            section_headers = [header_title, "Date", "Start", "End", "Hours", "Rate $", "Details"]
+            worksheet.write_row(start_row, 0, section_headers, header_format)
 
             data_start = start_row + 1
             # Keep one blank row in empty sections for manual additions and valid SUM ranges.
             row_count = max(len(data_rows), 1)
             for offset in range(row_count):
-                label = ""
                 if offset < len(data_rows):
                     row_data = data_rows[offset]
-                    label = row_data.get("label", "")
-                    worksheet.write(data_start + offset, 1, row_data.get("date", ""))
-                    worksheet.write(data_start + offset, 2, row_data.get("start", ""))
-                    worksheet.write(data_start + offset, 3, row_data.get("end", ""))
+                    worksheet.write_row(data_start + offset, 0, [
+                        row_data.get("label", ""),
+                        row_data.get("date", ""),
+                        row_data.get("start", ""),
+                        row_data.get("end", ""),
+                    ])
                     worksheet.write_number(data_start + offset, 4, row_data.get("hours", 0))
                     worksheet.write_number(data_start + offset, 5, row_data.get("rate", 0), currency_format)
                     worksheet.write(data_start + offset, 6, row_data.get("details", ""))
-                worksheet.write(data_start + offset, 0, label)
 
             total_row = data_start + row_count
             first_excel_row = data_start + 1
@@ -819,21 +870,21 @@ def process_timesheet(csv_file, output_excel, turno_csv=None, rates_csv=None, no
             }
 
         def write_expense_section(worksheet, start_row, data_rows):
-            worksheet.write(start_row, 0, "Expenses", header_format)
-            section_headers = ["Date", "Category", "Expense", "Vendor", "Amount $", "Reimbursable", "Details"]
-            for col, name in enumerate(section_headers, start=1):
-                worksheet.write(start_row, col, name, header_format)
+            section_headers = ["Expenses", "Date", "Category", "Expense", "Vendor", "Amount $", "Reimbursable", "Details"]
+            worksheet.write_row(start_row, 0, section_headers, header_format)
 
             data_start = start_row + 1
             row_count = max(1, len(data_rows))
             for offset in range(row_count):
                 if offset < len(data_rows):
                     row_data = data_rows[offset]
-                    worksheet.write(data_start + offset, 0, row_data.get("property", ""))
-                    worksheet.write(data_start + offset, 1, row_data.get("date", ""))
-                    worksheet.write(data_start + offset, 2, row_data.get("category", ""))
-                    worksheet.write(data_start + offset, 3, row_data.get("expense", ""))
-                    worksheet.write(data_start + offset, 4, row_data.get("vendor", ""))
+                    worksheet.write_row(data_start + offset, 0, [
+                        row_data.get("property", ""),
+                        row_data.get("date", ""),
+                        row_data.get("category", ""),
+                        row_data.get("expense", ""),
+                        row_data.get("vendor", ""),
+                    ])
                     worksheet.write_number(data_start + offset, 5, row_data.get("amount", 0), currency_format)
                     worksheet.write(data_start + offset, 6, row_data.get("reimbursable", "No"))
                     worksheet.write(data_start + offset, 7, row_data.get("details", ""))
@@ -870,11 +921,11 @@ def process_timesheet(csv_file, output_excel, turno_csv=None, rates_csv=None, no
                 worksheet.write(0, 0, f"Name: {person_name}", light_green_text_format)
             else:
                 worksheet.write(0, 0, f"Person ID: {person_id}, Name: {person_name}", light_green_text_format)
-            worksheet.write(0, 1, "", light_green_text_format)
+            worksheet.write_blank(0, 1, None, light_green_text_format)
 
+            # Row 2 stays empty; unformatted blank cells are not written at all.
             if person_period_text:
                 worksheet.write(1, 0, f"Period: {person_period_text}")
-            worksheet.write_blank(2, 0, None)
 
             worksheet.set_column("A:A", 24)
             worksheet.set_column("B:D", 14)
@@ -1009,7 +1060,6 @@ def process_timesheet(csv_file, output_excel, turno_csv=None, rates_csv=None, no
             worksheet.write_formula(total_dollar_idx, 4, final_total_formula, light_green_currency_format)
 
             review_cell = f"F{total_dollar_idx + 1}"
-            worksheet.write_blank(total_dollar_idx, 5, None)
             worksheet.data_validation(total_dollar_idx, 5, total_dollar_idx, 5, {
                 "validate": "list",
                 "source": ["", "y"],
@@ -1039,24 +1089,24 @@ def process_timesheet(csv_file, output_excel, turno_csv=None, rates_csv=None, no
                 reviewed_cell,
             ))
 
-        summary_sheet.write(0, 0, "Person", summary_header_format)
-        summary_sheet.write(0, 1, "Role", summary_header_format)
-        summary_sheet.write(0, 2, "Period", summary_header_format)
-        summary_sheet.write(0, 3, "Total Days", summary_header_format)
-        summary_sheet.write(0, 4, "Total Hours", summary_header_format)
-        summary_sheet.write(0, 5, "Total Cleans", summary_header_format)
-        summary_sheet.write(0, 6, "Total $", summary_header_format)
-        summary_sheet.write(0, 7, "Withheld $", summary_header_format)
-        summary_sheet.write(0, 8, "Pay/Hour", summary_header_format)
-        summary_sheet.write(0, 9, "Pay/Job", summary_header_format)
-        summary_sheet.write(0, 10, "Reviewed", summary_header_format)
+        summary_sheet.write_row(0, 0, [
+            "Person",
+            "Role",
+            "Period",
+            "Total Days",
+            "Total Hours",
+            "Total Cleans",
+            "Total $",
+            "Withheld $",
+            "Pay/Hour",
+            "Pay/Job",
+            "Reviewed",
+        ], summary_header_format)
 
         for idx, (label, role, entry_period, total_days, hours_ref, cleans_ref, total_ref, withheld_ref, reviewed_ref) in enumerate(summary_entries, start=1):
             excel_row = idx + 1
-            summary_sheet.write(idx, 0, label)
-            summary_sheet.write(idx, 1, role)
-            summary_sheet.write(idx, 2, entry_period)
-            summary_sheet.write_number(idx, 3, total_days)
+            # Rows go out one at a time: constant_memory drops column-wise writes to earlier rows.
+            summary_sheet.write_row(idx, 0, [label, role, entry_period, total_days])
             summary_sheet.write_formula(idx, 4, hours_ref)
             summary_sheet.write_formula(idx, 5, cleans_ref)
             summary_sheet.write_formula(idx, 6, total_ref, currency_format)